@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+import time
+
+from status_line_scan import JSONDecodeError, loads, scan_transcript
+
+# CONFIGURABLE: Context overhead (in tokens)
+# This represents the constant overhead from system prompts, tools, and other infrastructure
+# that Claude Code includes in the context but isn't reflected in the transcript's usage data.
+#
+# To update this value, run `/context` in Claude Code and sum up:
+#   - System prompt
+#   - System tools
+#   - MCP tools
+#   - Custom agents
+#   - Memory files
+#
+# Example calculation (adjust based on your /context output):
+#   3.1k (system) + 18.6k (tools) + 63.2k (MCP) + 2.2k (agents) + 1.2k (memory) = 88.3k
+CONTEXT_OVERHEAD = 88300  # Update this if you add/remove MCP tools or change configuration
+
+# Cached result of the latest Claude Code version check, stored as "status\ttimestamp\tttl"
+VERSION_CHECK_FILE = os.path.expanduser("~/.claude/version_check_cache")
+VERSION_CHECK_INTERVAL = 3600  # Check every hour
+VERSION_RETRY_INTERVAL = 900  # Retry failed checks after 15 minutes
+
+# Parsed transcript state, one file per session; files untouched for
+# TRANSCRIPT_CACHE_MAX_AGE seconds are removed when a new session starts
+TRANSCRIPT_CACHE_DIR = os.path.expanduser("~/.claude/statusline_cache")
+TRANSCRIPT_CACHE_MAX_AGE = 7 * 24 * 3600  # One week
+
+# Color codes
+RESET = "\033[0m"
+BOLD = "\033[1m"
+BLUE = "\033[94m"
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+ORANGE = "\033[38;5;208m"
+RED = "\033[91m"
+CYAN = "\033[96m"
+BRIGHT_CYAN = "\033[1;37m"  # Bright white for dark mode
+MAGENTA = "\033[95m"
+WHITE = "\033[97m"
+GRAY = "\033[90m"
+LIGHT_GRAY = "\033[37m"
+
+# Progress bar color for usage below each percentage, RED above the last one
+BAR_COLORS = ((50, GREEN), (80, YELLOW), (90, ORANGE))
+
+# Version color for each version check status, GREEN otherwise
+VERSION_COLORS = {"outdated": ORANGE}
+
+# Longest prompt shown before it's cut off with "..."
+PROMPT_MAX_LENGTH = 50
+
+# Progress bar, built by slicing these prebuilt full and empty bars
+BAR_LENGTH = 20
+FULL_BAR = "█" * BAR_LENGTH
+EMPTY_BAR = "░" * BAR_LENGTH
+
+# Status line layout, with the color codes baked in once at import
+STATUS_TEMPLATE = (
+    f"📁 {BRIGHT_CYAN}{{current_dir}}{RESET}{GREEN}{{git_branch}}{RESET} {GRAY}|{RESET} "
+    f"{BOLD}[{MAGENTA}{{model}}{RESET}{BOLD}]{RESET}"
+    f" | [{{bar_color}}{{bar}}{RESET}] {{bar_color}}{{context_used_rate:.1f}}%{RESET} "
+    f"({CYAN}{{context_used_token:,}}{RESET}) {GRAY}|{RESET} {WHITE}{{session_short}}{RESET} "
+    f"{GRAY}|{RESET} {{version_color}}{{version}} ({{version_status}}){RESET} {GRAY}|{RESET} "
+    f"{WHITE}{{current_time}}{RESET} {GRAY}|{RESET} {LIGHT_GRAY}{{last_prompt}}{RESET}\n"
+)
+
+
+def check_claude_version(current_version):
+    """Check if there's a newer version of Claude Code available, or None if we can't tell"""
+    # Only needed when the cache is stale, so keep them off the startup path
+    import urllib.error
+    import urllib.request
+
+    try:
+        # Try to get latest version from GitHub API
+        req = urllib.request.Request(
+            "https://api.github.com/repos/anthropics/claude-code/releases/latest",
+            headers={"User-Agent": "claude-status-line"},
+        )
+
+        with urllib.request.urlopen(req, timeout=2) as response:
+            data = loads(response.read())
+            latest_version = data.get("tag_name", "").lstrip("v")
+
+            if not latest_version:
+                return None
+
+            # Simple version comparison for semantic versioning
+            def version_to_tuple(v):
+                return tuple(map(int, v.split(".")[:3]))
+
+            try:
+                current_tuple = version_to_tuple(current_version.lstrip("v"))
+                latest_tuple = version_to_tuple(latest_version)
+
+                if current_tuple < latest_tuple:
+                    return "outdated"
+                else:
+                    return "current"
+            except ValueError:
+                return "current"
+
+    except (
+        urllib.error.URLError,
+        urllib.error.HTTPError,
+        JSONDecodeError,
+        Exception,
+    ):
+        # Let the caller cache the failure for a shorter time
+        return None
+
+
+def write_version_cache(status, ttl):
+    """Cache a version status for ttl seconds"""
+    os.makedirs(os.path.dirname(VERSION_CHECK_FILE), exist_ok=True)
+    tmp_file = f"{VERSION_CHECK_FILE}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
+        f.write(f"{status}\t{time.time()}\t{ttl}")
+    os.replace(tmp_file, VERSION_CHECK_FILE)
+
+
+def refresh_version_cache(version):
+    """Check for a newer version and cache the result for later runs"""
+    status = check_claude_version(version)
+
+    if status is None:
+        # If we can't check, assume current version is fine but retry sooner
+        write_version_cache("current", VERSION_RETRY_INTERVAL)
+    else:
+        write_version_cache(status, VERSION_CHECK_INTERVAL)
+
+
+def get_version_status(version):
+    """Get version status with caching, refreshing stale results in the background"""
+    try:
+        # Check if cache file exists and is recent; the TTL is stored in the
+        # file itself, so opening it is the only filesystem call needed
+        try:
+            with open(VERSION_CHECK_FILE, "r") as f:
+                fields = f.read().strip().split("\t")
+        except FileNotFoundError:
+            fields = [""]
+        status = fields[0] or "current"
+
+        try:
+            timestamp, ttl = float(fields[1]), float(fields[2])
+        except (IndexError, ValueError):
+            # Missing cache or old single-field format, treat as expired
+            timestamp, ttl = 0, 0
+
+        if time.time() - timestamp < ttl:
+            # Use cached result
+            return status
+
+        # Hold the stale entry for the retry interval so runs during the
+        # refresh don't each start their own check
+        write_version_cache(status, VERSION_RETRY_INTERVAL)
+
+        # Time to check for updates: do it in a detached process so the
+        # status line never waits on the network, and show the stale result
+        import subprocess
+
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--refresh-version", version],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+        return status
+
+    except Exception:
+        return "current"
+
+
+def get_git_branch():
+    """Get the current git branch, formatted for the status line"""
+    try:
+        try:
+            with open(".git/HEAD", "rb", buffering=0) as f:
+                head = f.read(256)
+        except NotADirectoryError:
+            # In worktrees and submodules .git is a file pointing at the real git dir
+            with open(".git", "rb", buffering=0) as f:
+                gitdir = f.read(4096).strip()
+            head = b""
+            if gitdir.startswith(b"gitdir: "):
+                with open(os.path.join(gitdir[8:], b"HEAD"), "rb", buffering=0) as f:
+                    head = f.read(256)
+
+        head = head.strip()
+        branch_prefix = b"ref: refs/heads/"
+        if head.startswith(branch_prefix):
+            return f" |⚡️ {head[len(branch_prefix):].decode(errors='replace')}"
+    except OSError:
+        pass
+
+    return ""
+
+
+def prune_transcript_cache():
+    """Remove cached transcript state for sessions that haven't been active recently"""
+    cutoff = time.time() - TRANSCRIPT_CACHE_MAX_AGE
+    try:
+        with os.scandir(TRANSCRIPT_CACHE_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
+
+def load_transcript_state(path, session_id):
+    """Get transcript usage tokens and last prompt, caching parsed state per session"""
+    cache_file = os.path.join(TRANSCRIPT_CACHE_DIR, session_id)
+
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        # If transcript file doesn't exist, report no usage
+        return 0, ""
+
+    try:
+        with open(cache_file, "rb") as f:
+            cache = loads(f.read())
+    except FileNotFoundError:
+        # First run for this session, a good time to clear out old ones
+        cache = {}
+        prune_transcript_cache()
+    except (OSError, ValueError):
+        cache = {}
+
+    # Anything that doesn't look like our own state is ignored and rescanned
+    if not isinstance(cache, dict) or "usage_tokens" not in cache or "last_prompt" not in cache:
+        cache = {}
+
+    # Transcript unchanged since the last run
+    if cache.get("size") == st.st_size and cache.get("mtime") == st.st_mtime_ns:
+        return cache["usage_tokens"], cache["last_prompt"]
+
+    # The transcript is append-only, so only the bytes added since the last
+    # run need scanning; anything not found there falls back to the cache
+    last_offset = cache.get("last_offset")
+    start = last_offset if isinstance(last_offset, int) and 0 < last_offset <= st.st_size else 0
+
+    state = scan_transcript(path, start, st.st_size, cache if start else None)
+
+    # Only resume from a line boundary, never from a half-written line
+    last_offset = st.st_size if state["complete"] else None
+
+    try:
+        os.makedirs(TRANSCRIPT_CACHE_DIR, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(
+                dict(state, size=st.st_size, mtime=st.st_mtime_ns, last_offset=last_offset),
+                f,
+            )
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+
+    return state["usage_tokens"], state["last_prompt"]
+
+
+def main():
+    """Render the status line for the session JSON on stdin"""
+    # Background version check spawned by get_version_status
+    if len(sys.argv) == 3 and sys.argv[1] == "--refresh-version":
+        try:
+            refresh_version_cache(sys.argv[2])
+        except Exception:
+            pass
+        return
+
+    # Read JSON from stdin
+    data = loads(sys.stdin.buffer.read())
+
+    # Extract values
+    model = data["model"]["display_name"]
+    model_id = data["model"]["id"]
+    current_dir = os.path.basename(data["workspace"]["current_dir"])
+    session_id = data["session_id"]
+    version = data["version"]
+
+    # Dynamically get context limit from model data
+    context_limit = data["model"].get("context_window")
+    if not context_limit:
+        # Fall back to the model ID: "200k" models have a 200k context,
+        # everything else defaults to 1M for newer models
+        context_limit = 200000 if "200k" in model_id.lower() else 1000000
+
+    # Check for git branch
+    git_branch = get_git_branch()
+
+    transcript_path = data["transcript_path"]
+
+    # Parse transcript file to get actual context usage from last assistant message
+    try:
+        usage_tokens, last_prompt = load_transcript_state(transcript_path, session_id)
+    except FileNotFoundError:
+        # Transcript disappeared while we were reading it
+        usage_tokens, last_prompt = 0, ""
+
+    # Total context usage = transcript usage + CONTEXT_OVERHEAD (see top of file)
+    # for system prompts, tools, and infrastructure
+    context_used_token = usage_tokens + CONTEXT_OVERHEAD if usage_tokens else 0
+
+    context_used_rate = (context_used_token / context_limit) * 100
+
+    # Create progress bar
+    filled_length = int(BAR_LENGTH * context_used_token // context_limit)
+    bar = FULL_BAR[:filled_length] + EMPTY_BAR[filled_length:]
+
+    # Get version status and format display
+    version_status = get_version_status(version)
+
+    version_color = VERSION_COLORS.get(version_status, GREEN)
+
+    # Session ID (first 8 characters)
+    session_short = session_id[:8]
+
+    # Color the progress bar based on usage percentage
+    bar_color = next((color for limit, color in BAR_COLORS if context_used_rate < limit), RED)
+
+    # Get current timestamp
+    current_time = time.strftime("%H:%M:%S")
+
+    # Fallback if no prompt found, truncate prompt if too long
+    if not last_prompt:
+        last_prompt = "no recent prompt"
+    elif len(last_prompt) > PROMPT_MAX_LENGTH:
+        last_prompt = last_prompt[: PROMPT_MAX_LENGTH - 3] + "..."
+
+    # Build comprehensive status line
+    status_line = STATUS_TEMPLATE.format(
+        current_dir=current_dir,
+        git_branch=git_branch,
+        model=model,
+        bar_color=bar_color,
+        bar=bar,
+        context_used_rate=context_used_rate,
+        context_used_token=context_used_token,
+        session_short=session_short,
+        version_color=version_color,
+        version=version,
+        version_status=version_status,
+        current_time=current_time,
+        last_prompt=last_prompt,
+    )
+
+    # A single line fits in one write, so skip the text I/O layer entirely
+    os.write(1, status_line.encode("utf-8"))
+
+
+if __name__ == "__main__":
+    main()
@@ -51,9 +51,11 @@ check_prerequisites() {
         print_warning "uv is not installed (recommended but optional)"
         print_info "Install uv with: curl -LsSf https://astral.sh/uv/install.sh | sh"
         USE_UV=false
+        PYTHON_CMD=(python3)
     else
         print_success "uv found: $(uv --version)"
         USE_UV=true
+        PYTHON_CMD=(uv run python)
     fi
 
     # Check Claude Code directory
@@ -77,19 +79,52 @@ install_script() {
     # Get the directory where this install script is located
     SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )"
 
-    # Copy the status line script
-    if [ -f "$SCRIPT_DIR/claude-code-status-line.py" ]; then
-        cp "$SCRIPT_DIR/claude-code-status-line.py" "$HOME/.claude/scripts/"
+    # Copy the status line launcher and the modules it imports
+    if [ -f "$SCRIPT_DIR/claude-code-status-line.py" ] && [ -f "$SCRIPT_DIR/claude_code_status_line.py" ] && [ -f "$SCRIPT_DIR/status_line_scan.py" ]; then
+        cp "$SCRIPT_DIR/claude-code-status-line.py" "$SCRIPT_DIR/claude_code_status_line.py" "$SCRIPT_DIR/status_line_scan.py" "$HOME/.claude/scripts/"
         chmod +x "$HOME/.claude/scripts/claude-code-status-line.py"
         print_success "Script installed to ~/.claude/scripts/claude-code-status-line.py"
     else
-        print_error "claude-code-status-line.py not found in current directory"
+        print_error "claude-code-status-line.py, claude_code_status_line.py or status_line_scan.py not found in current directory"
         exit 1
     fi
 
+    compile_scanner
+
     echo ""
 }
 
+# Compile the transcript scanner with mypyc (optional)
+compile_scanner() {
+    # Drop any extension from a previous install so it can't shadow the new source
+    rm -f "$HOME/.claude/scripts"/status_line_scan.*.so
+
+    # Build with the same interpreter the status line command runs, or
+    # Python won't load the extension
+    if ! (cd "$HOME/.claude/scripts" && "${PYTHON_CMD[@]}" -c "import mypyc") &> /dev/null; then
+        print_info "mypyc not found for '${PYTHON_CMD[*]}', using the pure Python transcript scanner"
+        print_info "Install mypy for that interpreter and re-run to compile it"
+        return
+    fi
+
+    print_info "Compiling transcript scanner with mypyc..."
+    BUILD_DIR="$(mktemp -d)"
+    cp "$HOME/.claude/scripts/status_line_scan.py" "$BUILD_DIR/"
+    if BUILD_LOG="$(cd "$BUILD_DIR" && "${PYTHON_CMD[@]}" -m mypyc status_line_scan.py 2>&1)"; then
+        cp "$BUILD_DIR"/status_line_scan.*.so "$HOME/.claude/scripts/"
+        if (cd "$HOME/.claude/scripts" && "${PYTHON_CMD[@]}" -c "import status_line_scan; assert status_line_scan.__file__.endswith('.so')") &> /dev/null; then
+            print_success "Transcript scanner compiled"
+        else
+            rm -f "$HOME/.claude/scripts"/status_line_scan.*.so
+            print_warning "Compiled scanner doesn't load under '${PYTHON_CMD[*]}', using the pure Python transcript scanner"
+        fi
+    else
+        echo "$BUILD_LOG" | grep -E ": error:" >&2 || echo "$BUILD_LOG" | tail -n 20 >&2
+        print_warning "mypyc compilation failed, using the pure Python transcript scanner"
+    fi
+    rm -rf "$BUILD_DIR"
+}
+
 # Update settings
 update_settings() {
     print_info "Updating Claude Code settings..."
@@ -202,7 +237,7 @@ print_instructions() {
     echo "  1. Restart Claude Code to activate the status line"
     echo "  2. Run '/context' in Claude Code to see your context breakdown"
     echo "  3. Update CONTEXT_OVERHEAD in the script if needed:"
-    echo "     ~/.claude/scripts/claude-code-status-line.py"
+    echo "     ~/.claude/scripts/claude_code_status_line.py"
     echo ""
     print_info "To update the overhead:"
     echo "  1. Run '/context' in Claude Code"
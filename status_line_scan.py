@@ -0,0 +1,184 @@
+"""Transcript scanning for the status line.
+
+Kept in its own typed module so it can optionally be compiled with mypyc
+(install.sh does this when mypyc is available). The compiled extension is
+imported in preference to this file; without it this file is used as is.
+"""
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+# Prefer orjson for parsing when it's installed, it's noticeably faster on
+# large transcripts; the standard library handles everything otherwise
+try:
+    from orjson import JSONDecodeError, loads  # type: ignore
+except ImportError:
+    from json import JSONDecodeError, loads  # type: ignore
+
+# How many transcript lines past the latest usage to search for the last prompt,
+# so long sessions don't scan the whole transcript for one
+MAX_PROMPT_LOOKBACK = 200
+
+
+def tail_lines(path: str, start: int = 0, end: Optional[int] = None, block: int = 65536) -> Iterator[bytes]:
+    """Yield raw lines of a file from last to first, reading backwards in blocks"""
+    with open(path, "rb") as f:
+        position = os.fstat(f.fileno()).st_size if end is None else end
+        leftover = b""
+        while position > start:
+            step = min(block, position - start)
+            position -= step
+            f.seek(position)
+            chunk = f.read(step) + leftover
+            lines = chunk.split(b"\n")
+            # The first piece may be the tail of a line that continues in the
+            # previous block, so hold it back until we've read further
+            leftover = lines.pop(0)
+            yield from reversed(lines)
+        if leftover:
+            yield leftover
+
+
+def extract_text(content: Any) -> str:
+    """Get the prompt text from a message's content, or "" if there is none"""
+    if isinstance(content, str):
+        return content
+    if not isinstance(content, list):
+        return ""
+
+    # Structured content: join the text parts, otherwise fall back to the
+    # first non-empty text-like item
+    text_parts: List[str] = []
+    fallback = ""
+    for part in content:
+        if isinstance(part, dict):
+            text = part.get("text")
+            if not isinstance(text, str):
+                continue
+            if part.get("type") == "text":
+                text_parts.append(text)
+            if text and not fallback:
+                fallback = text
+        elif isinstance(part, str) and part and not fallback:
+            fallback = part
+
+    return " ".join(text_parts) or fallback
+
+
+def scan_transcript(
+    path: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    previous: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Find the latest usage token count and user prompt between start and end
+
+    Positions in the returned state count non-empty lines back from end, -1
+    meaning not found, and complete tells whether the data ends on a line
+    boundary. previous is the state of the transcript up to start, used for
+    whatever isn't found in the newly appended lines.
+    """
+    usage_tokens = 0
+    usage_line = -1
+    last_prompt = ""
+    prompt_line = -1
+    line_count = 0
+    complete: Optional[bool] = None
+
+    # Iterate from last line to first line
+    for line in tail_lines(path, start, end):
+        if complete is None:
+            # The last piece is empty exactly when the data ends with a newline
+            complete = not line
+        if not line:
+            continue
+        index = line_count
+        line_count += 1
+
+        # Once usage is found, give up on the prompt after a bounded window
+        if usage_line >= 0 and index - usage_line > MAX_PROMPT_LOOKBACK:
+            break
+
+        # Only user and assistant entries matter, so skip other entry types
+        # (summaries, system messages, ...) without paying for a full parse.
+        # Tool results are user entries and still get parsed
+        if b'"type":"assistant"' not in line and b'"type":"user"' not in line:
+            continue
+
+        try:
+            obj = loads(line)
+
+            # Get last user message for prompt (skip meta messages)
+            if (
+                obj.get("type") == "user"
+                and "message" in obj
+                and not last_prompt
+                and not obj.get("isMeta", False)
+            ):  # Skip meta messages
+
+                last_prompt = extract_text(obj["message"].get("content", ""))
+                if last_prompt:
+                    prompt_line = index
+
+            # Get the TOTAL context usage from the most recent assistant message
+            # This includes all tokens: system prompts, tools, messages, etc.
+            if (
+                obj.get("type") == "assistant"
+                and usage_line < 0
+                and "message" in obj
+                and "usage" in obj["message"]
+            ):
+                usage = obj["message"]["usage"]
+
+                # Get all token counts from usage
+                input_tokens = usage.get("input_tokens", 0)
+                cache_creation_input_tokens = usage.get("cache_creation_input_tokens", 0)
+                cache_read_input_tokens = usage.get("cache_read_input_tokens", 0)
+                output_tokens = usage.get("output_tokens", 0)
+
+                # Usage = sum of all token types, the caller adds CONTEXT_OVERHEAD
+                # input_tokens: fresh tokens processed
+                # cache_creation_input_tokens: tokens used to create cache
+                # cache_read_input_tokens: tokens read from cache
+                # output_tokens: tokens generated in response
+                usage_tokens = (
+                    input_tokens
+                    + cache_creation_input_tokens
+                    + cache_read_input_tokens
+                    + output_tokens
+                )
+                usage_line = index
+
+                # Don't break - keep looking for user prompt
+
+            # If we have both token usage and user prompt, we can break
+            if usage_line >= 0 and last_prompt:
+                break
+
+        except (JSONDecodeError, UnicodeDecodeError):
+            # Skip malformed JSON lines
+            continue
+
+    if complete is None:
+        # Nothing appended since start, which is itself a line boundary
+        complete = start > 0
+
+    # Fill in from the earlier part of the transcript, shifting its positions
+    # past the lines scanned here; the cached prompt still has to fall inside
+    # the lookback window, exactly as if the whole transcript had been scanned
+    if previous:
+        if usage_line < 0 and previous.get("usage_line", -1) >= 0:
+            usage_tokens = previous["usage_tokens"]
+            usage_line = line_count + previous["usage_line"]
+        if prompt_line < 0 and previous.get("prompt_line", -1) >= 0:
+            candidate_line = line_count + previous["prompt_line"]
+            if usage_line < 0 or candidate_line - usage_line <= MAX_PROMPT_LOOKBACK:
+                last_prompt = previous["last_prompt"]
+                prompt_line = candidate_line
+
+    return {
+        "usage_tokens": usage_tokens,
+        "usage_line": usage_line,
+        "last_prompt": last_prompt,
+        "prompt_line": prompt_line,
+        "complete": complete,
+    }